@@ -4,7 +4,12 @@ RAW Labour Hire - Database Configuration
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.types import DateTime
 import os
+from uuid import uuid4
 
 # Database URL - default to SQLite for development
 DATABASE_URL = os.getenv(
@@ -21,9 +26,34 @@ elif DATABASE_URL.startswith("postgresql://"):
 # Check if running in production
 IS_PRODUCTION = os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("PRODUCTION", "").lower() == "true"
 
+# Connection pool sizing - the admin dashboard polls several endpoints at once,
+# so keep enough warm connections that requests don't pay connect/auth setup
+POOL_OPTIONS = {}
+if os.getenv("DB_USE_PGBOUNCER", "").lower() == "true":
+    # PgBouncer (transaction pooling) owns the pool - hold no connections here
+    # Prepared statements don't survive transaction pooling - disable both
+    # asyncpg's and SQLAlchemy's caches and give each statement a unique name
+    POOL_OPTIONS = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+elif not DATABASE_URL.startswith("sqlite"):
+    POOL_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),  # seconds to wait for a connection
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),  # seconds
+        "pool_pre_ping": True,  # Drop connections the server has closed
+    }
+
 engine = create_async_engine(
     DATABASE_URL,
     echo=not IS_PRODUCTION,  # Disable SQL logging in production
+    **POOL_OPTIONS,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -37,6 +67,23 @@ class Base(DeclarativeBase):
     pass
 
 
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database"""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP follows the session time zone - pin it to UTC
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
 async def get_db():
     """Dependency to get database session"""
     async with AsyncSessionLocal() as session:
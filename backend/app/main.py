@@ -6,10 +6,13 @@ Main FastAPI Application
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from contextlib import asynccontextmanager
+import logging
+import logging.handlers
 import os
+import queue
 
 
 class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
@@ -32,11 +35,32 @@ from sqlalchemy import text, select, func
 from .routes import auth, timesheets, users, clients, clock, myob, tickets, induction, jobsites, notifications
 from .database import engine, Base, AsyncSessionLocal
 from .models import Client, JobSite, TicketType, InductionDocument
+from .services.cache import init_cache, close_cache
+from .services.sms import close_sms_client
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Send app logs through a queue so a background thread does the writing"""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    app_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    app_logger.propagate = False
+    
+    return logging.handlers.QueueListener(log_queue, stream_handler)
+
+
+log_listener = setup_logging()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
+    log_listener.start()
+    
     # Create database tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -101,6 +125,34 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             print(f"Migration note (job assignment): {e}")
 
+        # Indexes for the worker/user list filters and sort order
+        try:
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_users_active_sorted
+                ON users (surname, first_name, id) INCLUDE (email, phone, role, is_active)
+                WHERE is_active;
+            """))
+            # Superseded by ix_users_active_sorted
+            await conn.execute(text("""
+                DROP INDEX IF EXISTS ix_users_active_surname;
+            """))
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_users_role_active
+                ON users (role, is_active, surname);
+            """))
+        except Exception as e:
+            print(f"Migration note (user indexes): {e}")
+
+        # Partial index for the active clock-in lookup
+        try:
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_timesheet_entries_active
+                ON timesheet_entries (timesheet_id)
+                WHERE clock_out_time IS NULL AND clock_in_time IS NOT NULL;
+            """))
+        except Exception as e:
+            print(f"Migration note (timesheet entry indexes): {e}")
+
     # Seed a default client/job site if none exist
     async with AsyncSessionLocal() as session:
         result = await session.execute(
@@ -410,6 +462,9 @@ async def lifespan(app: FastAPI):
                 session.add(doc)
             await session.commit()
     
+    # Connect the response cache (no-op when REDIS_URL isn't set)
+    await init_cache()
+    
     # Start the automatic reminder scheduler
     from .services.scheduler import start_scheduler, stop_scheduler
     start_scheduler()
@@ -417,8 +472,11 @@ async def lifespan(app: FastAPI):
     yield
     
     # Cleanup on shutdown
-    stop_scheduler()
+    await stop_scheduler()
+    await close_cache()
+    await close_sms_client()
     await engine.dispose()
+    log_listener.stop()
 
 
 app = FastAPI(
@@ -426,6 +484,7 @@ app = FastAPI(
     description="Digital timesheet system with GPS tracking and MYOB integration",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson encodes dates and enums natively
 )
 
 # Fix HTTPS redirects in production (must be added first)
@@ -7,7 +7,7 @@ from datetime import datetime, date, time
 from typing import Optional, List
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, DateTime, Date, Time,
-    ForeignKey, Text, Enum as SQLEnum
+    ForeignKey, Text, Index, Enum as SQLEnum, text
 )
 from sqlalchemy.orm import relationship
 from enum import Enum
@@ -121,6 +121,18 @@ class User(Base):
     supervised_timesheets = relationship("Timesheet", back_populates="supervisor", 
                                          foreign_keys="Timesheet.supervisor_id")
     assigned_job_site = relationship("JobSite", foreign_keys=[assigned_job_site_id])
+    
+    __table_args__ = (
+        # Worker and user lists: WHERE is_active ORDER BY surname, first_name, id.
+        # INCLUDE lets Postgres answer the user list from the index alone
+        Index(
+            "ix_users_active_sorted", "surname", "first_name", "id",
+            postgresql_include=["email", "phone", "role", "is_active"],
+            postgresql_where=text("is_active"), sqlite_where=text("is_active"),
+        ),
+        # User list filtered by role
+        Index("ix_users_role_active", "role", "is_active", "surname"),
+    )
 
 
 # ==================== CLIENTS ====================
@@ -296,6 +308,15 @@ class TimesheetEntry(Base):
     # Relationships
     timesheet = relationship("Timesheet", back_populates="entries")
     job_site = relationship("JobSite", back_populates="timesheet_entries")
+    
+    __table_args__ = (
+        # Currently clocked-in entries - stays small however many entries pile up
+        Index(
+            "ix_timesheet_entries_active", "timesheet_id",
+            postgresql_where=text("clock_out_time IS NULL AND clock_in_time IS NOT NULL"),
+            sqlite_where=text("clock_out_time IS NULL AND clock_in_time IS NOT NULL"),
+        ),
+    )
 
 
 # ==================== USER TICKETS/CERTIFICATIONS ====================
@@ -6,12 +6,15 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import raiseload, make_transient_to_detached
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import asyncio
 import hashlib
+import orjson
 import os
 import secrets
 
@@ -19,6 +22,7 @@ from ..database import get_db
 from ..models import User, UserRole
 from ..email import send_password_reset_email
 from ..services.sms import send_sms
+from ..services.cache import AUTH_CACHE_TTL, get_cached, set_cached, invalidate_user, user_cache_key
 
 router = APIRouter()
 
@@ -27,7 +31,15 @@ SECRET_KEY = "your-secret-key-change-in-production"  # TODO: Move to env
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 1 week
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing - argon2 for new hashes; existing bcrypt hashes still verify
+# and are upgraded on the next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
@@ -81,6 +93,33 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Verify a password, returning a replacement hash if the stored one is outdated"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# Each argon2 hash holds 64 MiB while it runs - bound how many run at once
+PASSWORD_HASH_CONCURRENCY = 4
+_hash_semaphore = asyncio.Semaphore(PASSWORD_HASH_CONCURRENCY)
+
+
+async def run_password_kdf(func, *args):
+    """Run a password hash or verify on the default thread pool"""
+    # Password hashing is deliberately slow - keep it off the event loop
+    loop = asyncio.get_running_loop()
+    async with _hash_semaphore:
+        return await loop.run_in_executor(None, func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password with the auth KDF on the default thread pool"""
+    return await run_password_kdf(get_password_hash, password)
+
+
+# Columns routes read off the current user - cached between requests
+CURRENT_USER_FIELDS = ("id", "email", "first_name", "surname", "phone", "role", "is_active")
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
@@ -105,11 +144,31 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Keyed by user id rather than token so role changes and deactivation
+    # drop it along with the user's other cached renderings
+    cache_key = user_cache_key(user_id, "auth")
+    cached = await get_cached(cache_key)
+    if cached:
+        data = orjson.loads(cached)
+        user = User(**{**data, "role": UserRole(data["role"])})
+        make_transient_to_detached(user)  # Behaves like a clean, loaded row
+        return user
     
+    # Primary-key lookup goes through the session identity map first;
+    # every route reads only scalar columns off the current user
+    user = await db.get(User, user_id, options=[raiseload("*")])
+    # End the read transaction so the pooled connection goes back now rather
+    # than after the response (expire_on_commit=False keeps the user loaded)
+    await db.commit()
+
     if user is None:
         raise credentials_exception
+    
+    await set_cached(
+        cache_key,
+        orjson.dumps({field: getattr(user, field) for field in CURRENT_USER_FIELDS}),
+        ttl=AUTH_CACHE_TTL,
+    )
     return user
 
 
@@ -141,7 +200,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     # Create user
     user = User(
         email=user_data.email,
-        hashed_password=get_password_hash(password),
+        hashed_password=await hash_password_async(password),
         first_name=user_data.first_name,
         surname=user_data.surname,
         phone=user_data.phone,
@@ -171,13 +230,25 @@ async def login(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if user:
+        verified, new_hash = await run_password_kdf(
+            verify_and_update_password, form_data.password, user.hashed_password
+        )
+    else:
+        verified, new_hash = False, None
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade legacy bcrypt hashes to argon2
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -345,6 +416,7 @@ async def update_profile(
     
     await db.commit()
     await db.refresh(user)
+    await invalidate_user(user.id)
     
     return {
         "message": "Profile updated successfully",
@@ -370,7 +442,7 @@ async def change_password(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Verify current password
-    if not verify_password(data.current_password, user.hashed_password):
+    if not await run_password_kdf(verify_password, data.current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -390,7 +462,7 @@ async def change_password(
         )
     
     # Update password
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await hash_password_async(new_password)
     await db.commit()
     
     return {"message": "Password changed successfully"}
@@ -468,7 +540,7 @@ async def confirm_password_reset(
             detail="Invalid or expired reset token"
         )
 
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await hash_password_async(new_password)
     user.reset_token_used_at = datetime.utcnow()
     user.reset_token_hash = None
     user.reset_token_expires_at = None
@@ -515,6 +587,22 @@ async def admin_login(data: AdminLogin):
     )
 
 
+def require_admin_token(token: str = Depends(oauth2_scheme)) -> str:
+    """Require a valid admin dashboard token (from /admin/login)"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("type") == "admin":
+            return payload.get("sub")
+    except JWTError:
+        pass
+    
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 @router.get("/admin/verify")
 async def verify_admin_token(token: str):
     """Verify admin token is valid"""
@@ -11,12 +11,12 @@ from datetime import datetime, date, timedelta
 from typing import Optional
 from geopy.geocoders import Nominatim
 from geopy.distance import geodesic
-import pytz
+from zoneinfo import ZoneInfo
 
 from ..database import get_db
 
 # Australian Eastern Time
-SYDNEY_TZ = pytz.timezone('Australia/Sydney')
+SYDNEY_TZ = ZoneInfo('Australia/Sydney')
 
 def get_sydney_now():
     """Get current time in Australian Eastern Time"""
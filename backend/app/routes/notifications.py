@@ -5,15 +5,17 @@ Handles SMS reminders for clock in/out
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, exists
 from pydantic import BaseModel
 from datetime import datetime, date, time, timedelta
 from typing import Optional, List
+from zoneinfo import ZoneInfo
 
 from ..database import get_db
-from ..models import User, TimesheetEntry, NotificationSettings
+from ..models import User, Timesheet, TimesheetEntry, NotificationSettings
 from ..services.sms import (
     send_sms,
+    send_bulk_sms,
     clock_in_reminder_message,
     clock_out_reminder_message,
     timesheet_approved_message,
@@ -22,6 +24,9 @@ from ..services.sms import (
 
 router = APIRouter()
 
+# Reminder schedules are in Australian Eastern time
+SYDNEY_TZ = ZoneInfo('Australia/Sydney')
+
 
 @router.get("/test-sms/{phone}")
 async def test_sms(phone: str):
@@ -178,6 +183,29 @@ async def send_sms_to_worker(
 # ==================== SCHEDULED REMINDER ENDPOINTS ====================
 # These should be called by a cron job or scheduler
 
+# Worker columns the reminder checks read
+REMINDER_WORKER_COLUMNS = (
+    User.id, User.first_name, User.surname, User.phone,
+    User.shift_start_time, User.shift_end_time,
+    User.works_monday, User.works_tuesday, User.works_wednesday, User.works_thursday,
+    User.works_friday, User.works_saturday, User.works_sunday,
+)
+
+
+async def send_reminder_batch(recipients: list) -> tuple:
+    """Send (worker, message) reminders as one rate-limited batch; returns (sent, errors)"""
+    results = await send_bulk_sms([(worker.phone, message) for worker, message in recipients])
+    errors = [
+        {
+            "worker": f"{worker.first_name} {worker.surname}",
+            "error": result.get("error")
+        }
+        for (worker, _), result in zip(recipients, results)
+        if not result["success"]
+    ]
+    return len(recipients) - len(errors), errors
+
+
 def worker_should_work_today(worker, today: date) -> bool:
     """Check if worker is scheduled to work today based on their schedule"""
     day_of_week = today.weekday()  # 0=Monday, 6=Sunday
@@ -217,9 +245,11 @@ async def check_clock_in_reminders(
     Check for workers who haven't clocked in and send reminders.
     Only sends to workers whose shift has started based on their individual schedule.
     """
-    import pytz
-    from datetime import datetime as dt
-    
+    return await send_clock_in_reminders(db, datetime.now(SYDNEY_TZ))
+
+
+async def send_clock_in_reminders(db: AsyncSession, now: datetime) -> dict:
+    """Send clock-in reminders as of `now` (Sydney time)"""
     # Get notification settings
     settings_result = await db.execute(select(NotificationSettings).limit(1))
     settings = settings_result.scalar_one_or_none()
@@ -230,26 +260,36 @@ async def check_clock_in_reminders(
     if settings and not settings.sms_enabled:
         return {"message": "SMS notifications disabled", "sent": 0}
     
-    # Get current time in Sydney timezone
-    sydney_tz = pytz.timezone('Australia/Sydney')
-    now = dt.now(sydney_tz)
     today = now.date()
     current_time = now.time()
     
-    # Get all active workers
+    # Has this worker clocked in today? Entries reach workers via their timesheet
+    clocked_in_today = (
+        exists()
+        .where(
+            Timesheet.worker_id == User.id,
+            TimesheetEntry.timesheet_id == Timesheet.id,
+            TimesheetEntry.entry_date == today,
+            TimesheetEntry.clock_in_time != None
+        )
+    )
+    
+    # Active workers with a phone who haven't clocked in today, in one query
     workers_result = await db.execute(
-        select(User).where(User.is_active == True)
+        select(*REMINDER_WORKER_COLUMNS)
+        .where(
+            User.is_active == True,
+            User.phone != None,
+            User.phone != "",
+            ~clocked_in_today
+        )
     )
-    workers = workers_result.scalars().all()
+    workers = workers_result.all()
     
-    sent_count = 0
     skipped_count = 0
-    errors = []
+    recipients = []
     
     for worker in workers:
-        if not worker.phone:
-            continue
-        
         # Check if worker should work today
         if not worker_should_work_today(worker, today):
             skipped_count += 1
@@ -260,30 +300,9 @@ async def check_clock_in_reminders(
             skipped_count += 1
             continue
         
-        # Check if worker has clocked in today
-        entry_result = await db.execute(
-            select(TimesheetEntry).where(
-                and_(
-                    TimesheetEntry.user_id == worker.id,
-                    TimesheetEntry.entry_date == today,
-                    TimesheetEntry.clock_in_time != None
-                )
-            )
-        )
-        has_clocked_in = entry_result.scalar_one_or_none() is not None
-        
-        if not has_clocked_in:
-            # Send reminder
-            message = clock_in_reminder_message(worker.first_name)
-            result = await send_sms(worker.phone, message)
-            
-            if result["success"]:
-                sent_count += 1
-            else:
-                errors.append({
-                    "worker": f"{worker.first_name} {worker.surname}",
-                    "error": result.get("error")
-                })
+        recipients.append((worker, clock_in_reminder_message(worker.first_name)))
+    
+    sent_count, errors = await send_reminder_batch(recipients)
     
     return {
         "message": f"Clock-in reminders sent",
@@ -301,9 +320,11 @@ async def check_clock_out_reminders(
     Check for workers who clocked in but haven't clocked out and send reminders.
     Only sends to workers whose shift has ended based on their individual schedule.
     """
-    import pytz
-    from datetime import datetime as dt
-    
+    return await send_clock_out_reminders(db, datetime.now(SYDNEY_TZ))
+
+
+async def send_clock_out_reminders(db: AsyncSession, now: datetime) -> dict:
+    """Send clock-out reminders as of `now` (Sydney time)"""
     # Get notification settings
     settings_result = await db.execute(select(NotificationSettings).limit(1))
     settings = settings_result.scalar_one_or_none()
@@ -314,37 +335,33 @@ async def check_clock_out_reminders(
     if settings and not settings.sms_enabled:
         return {"message": "SMS notifications disabled", "sent": 0}
     
-    # Get current time in Sydney timezone
-    sydney_tz = pytz.timezone('Australia/Sydney')
-    now = dt.now(sydney_tz)
     today = now.date()
     current_time = now.time()
     
     # Get all timesheet entries for today that have clock-in but no clock-out
     entries_result = await db.execute(
-        select(TimesheetEntry, User)
-        .join(User, TimesheetEntry.user_id == User.id)
+        select(TimesheetEntry.overtime_mode, *REMINDER_WORKER_COLUMNS)
+        .join(Timesheet, TimesheetEntry.timesheet_id == Timesheet.id)
+        .join(User, Timesheet.worker_id == User.id)
         .where(
             and_(
                 TimesheetEntry.entry_date == today,
                 TimesheetEntry.clock_in_time != None,
                 TimesheetEntry.clock_out_time == None,
-                User.is_active == True
+                User.is_active == True,
+                User.phone != None,
+                User.phone != ""
             )
         )
     )
     entries = entries_result.all()
     
-    sent_count = 0
     skipped_count = 0
-    errors = []
+    recipients = []
     
-    for entry, worker in entries:
-        if not worker.phone:
-            continue
-        
+    for worker in entries:
         # Skip workers in overtime mode - they're staying back intentionally
-        if entry.overtime_mode:
+        if worker.overtime_mode:
             skipped_count += 1
             continue
         
@@ -353,17 +370,9 @@ async def check_clock_out_reminders(
             skipped_count += 1
             continue
         
-        # Send reminder
-        message = clock_out_reminder_message(worker.first_name)
-        result = await send_sms(worker.phone, message)
-        
-        if result["success"]:
-            sent_count += 1
-        else:
-            errors.append({
-                "worker": f"{worker.first_name} {worker.surname}",
-                "error": result.get("error")
-            })
+        recipients.append((worker, clock_out_reminder_message(worker.first_name)))
+    
+    sent_count, errors = await send_reminder_batch(recipients)
     
     return {
         "message": f"Clock-out reminders sent",
@@ -8,12 +8,12 @@ from sqlalchemy import select
 from pydantic import BaseModel
 from datetime import datetime, date, timedelta
 from typing import Optional, List
-import pytz
+from zoneinfo import ZoneInfo
 
 from ..database import get_db
 
 # Australian Eastern Time
-SYDNEY_TZ = pytz.timezone('Australia/Sydney')
+SYDNEY_TZ = ZoneInfo('Australia/Sydney')
 
 def get_sydney_now():
     """Get current time in Australian Eastern Time"""
@@ -2,45 +2,64 @@
 RAW Labour Hire - Users API (Admin)
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from pydantic import BaseModel
+from sqlalchemy import select, update, exists, tuple_, and_, func, literal, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import raiseload
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_serializer
 from typing import Optional
-from datetime import date, datetime
-import hashlib
+from datetime import date, datetime, time
+import asyncio
+import base64
+import binascii
+import os
 import secrets
 
-from ..database import get_db
-from ..models import User, UserRole, JobSite, TimesheetEntry
-from .auth import get_current_user
+import orjson
+
+from ..database import get_db, engine, AsyncSessionLocal, utcnow
+from ..services.cache import get_cached, set_cached, invalidate_user, invalidate_users, user_cache_key
+from ..models import User, UserRole, JobSite, Timesheet, TimesheetEntry
+from .auth import get_current_user, hash_password_async, require_admin_token
 
 router = APIRouter()
 
+# ON CONFLICT support lives in the dialect-specific insert() constructs
+insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+
+# Shared single-user lookup - built once instead of per request
+USER_BY_ID = select(User).options(raiseload("*")).where(User.id == bindparam("user_id"))
+
 
 # ==================== MOBILE APP ENDPOINTS ====================
 
 @router.get("/{user_id}")
-async def get_user_profile(
-    user_id: int,
-    db: AsyncSession = Depends(get_db)
-):
+async def get_user_profile(user_id: int):
     """Get user profile by ID (for mobile app)"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    u = result.scalar_one_or_none()
+    cache_key = user_cache_key(user_id, "profile")
+    cached = await get_cached(cache_key)
+    if cached:
+        return Response(content=cached, media_type="application/json")
+    
+    # Hold a pooled connection only for the lookup, not for encoding and caching
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(USER_BY_ID, {"user_id": user_id})
+        u = result.scalar_one_or_none()
     
     if not u:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return {
+    payload = orjson.dumps({
         "id": u.id,
         "email": u.email,
         "first_name": u.first_name,
         "surname": u.surname,
         "phone": u.phone,
-        "role": u.role.value if u.role else "worker",
-        "date_of_birth": u.date_of_birth.isoformat() if u.date_of_birth else None,
-        "start_date": u.start_date.isoformat() if u.start_date else None,
+        "role": u.role or UserRole.WORKER,
+        "date_of_birth": u.date_of_birth,
+        "start_date": u.start_date,
         # Address
         "address": u.address,
         "suburb": u.suburb,
@@ -58,10 +77,16 @@ async def get_user_profile(
         # Employment
         "employment_type": u.employment_type or "casual",
         "is_active": u.is_active,
-    }
+    })
+    await set_cached(cache_key, payload)
+    
+    return Response(content=payload, media_type="application/json")
 
 
 class WorkerCreate(BaseModel):
+    # Trim form input in pydantic-core; unknown keys from the dashboard are dropped
+    model_config = ConfigDict(str_strip_whitespace=True, extra="ignore")
+    
     email: str
     first_name: str
     surname: str
@@ -88,6 +113,9 @@ class WorkerCreate(BaseModel):
 
 
 class WorkerUpdate(BaseModel):
+    # Trim form input in pydantic-core; unknown keys from the dashboard are dropped
+    model_config = ConfigDict(str_strip_whitespace=True, extra="ignore")
+    
     first_name: Optional[str] = None
     surname: Optional[str] = None
     phone: Optional[str] = None
@@ -112,6 +140,58 @@ class WorkerUpdate(BaseModel):
     role: Optional[str] = None
 
 
+def worker_insert_values(worker: WorkerCreate, hashed_password: str) -> dict:
+    """Column values for inserting a new worker row"""
+    return {
+        "email": worker.email,
+        "hashed_password": hashed_password,
+        "first_name": worker.first_name,
+        "surname": worker.surname,
+        "phone": worker.phone,
+        "address": worker.address,
+        "suburb": worker.suburb,
+        "state": worker.state,
+        "postcode": worker.postcode,
+        "date_of_birth": worker.date_of_birth,
+        "start_date": worker.start_date,
+        "emergency_contact_name": worker.emergency_contact_name,
+        "emergency_contact_phone": worker.emergency_contact_phone,
+        "emergency_contact_relationship": worker.emergency_contact_relationship,
+        "bank_account_name": worker.bank_account_name,
+        "bank_bsb": worker.bank_bsb,
+        "bank_account_number": worker.bank_account_number,
+        "tax_file_number": worker.tax_file_number,
+        "base_pay_rate": worker.base_pay_rate or 0,
+        "overtime_pay_rate": worker.overtime_pay_rate or 0,
+        "weekend_pay_rate": worker.weekend_pay_rate or 0,
+        "night_pay_rate": worker.night_pay_rate or 0,
+        "employment_type": worker.employment_type or "casual",
+        "role": UserRole(worker.role) if worker.role else UserRole.WORKER,
+        "is_active": True,
+    }
+
+
+async def update_user_fields(db: AsyncSession, user_id: int, **values) -> bool:
+    """UPDATE a user row in one round-trip; returns False if the user doesn't exist"""
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(**values).returning(User.id)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+# Same size as secrets.token_urlsafe(12) used for single workers
+TEMP_PASSWORD_BYTES = 12
+
+
+def generate_temp_passwords(count: int) -> list[str]:
+    """Generate temporary passwords from a single read of the OS CSPRNG"""
+    entropy = os.urandom(TEMP_PASSWORD_BYTES * count)
+    return [
+        base64.urlsafe_b64encode(entropy[i:i + TEMP_PASSWORD_BYTES]).rstrip(b"=").decode()
+        for i in range(0, len(entropy), TEMP_PASSWORD_BYTES)
+    ]
+
+
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
     """Require admin role"""
     if current_user.role != UserRole.ADMIN:
@@ -119,169 +199,308 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
-@router.get("/")
+# Endpoints for authenticated admin users - require_admin runs once per request
+admin_router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@admin_router.get("/")
 async def list_users(
     role: Optional[str] = None,
-    active_only: bool = True,
-    current_user: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db)
+    active_only: bool = True
 ):
     """List all users (admin only)"""
-    query = select(User)
+    query = select(
+        User.id, User.email, User.first_name, User.surname,
+        User.phone, User.role, User.is_active
+    )
     
     if role:
         query = query.where(User.role == UserRole(role))
     if active_only:
         query = query.where(User.is_active == True)
     
-    result = await db.execute(query.order_by(User.surname))
-    users = result.scalars().all()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(query.order_by(User.surname))
+        users = [dict(row) for row in result.mappings()]
     
-    return {
-        "users": [
-            {
-                "id": u.id,
-                "email": u.email,
-                "first_name": u.first_name,
-                "surname": u.surname,
-                "phone": u.phone,
-                "role": u.role.value,
-                "is_active": u.is_active
-            }
-            for u in users
-        ]
-    }
+    return {"users": users}
 
 
 # ==================== ADMIN DASHBOARD ENDPOINTS (No Auth) ====================
 
+# Columns serialized by list_all_workers
+WORKER_LIST_COLUMNS = (
+    User.id, User.email, User.first_name, User.surname, User.phone,
+    User.address, User.suburb, User.state, User.postcode,
+    User.date_of_birth, User.start_date,
+    User.emergency_contact_name, User.emergency_contact_phone,
+    User.emergency_contact_relationship,
+    # Bank and TFN details are left to the single-worker endpoint
+    # Defaults are filled in by the database so rows serialize as straight copies
+    func.coalesce(User.base_pay_rate, 0).label("base_pay_rate"),
+    func.coalesce(User.overtime_pay_rate, 0).label("overtime_pay_rate"),
+    func.coalesce(User.weekend_pay_rate, 0).label("weekend_pay_rate"),
+    func.coalesce(User.night_pay_rate, 0).label("night_pay_rate"),
+    func.coalesce(User.employment_type, "casual").label("employment_type"),
+    func.coalesce(User.role, literal(UserRole.WORKER, User.role.type)).label("role"),
+    User.is_active, User.created_at,
+    # Shift schedule
+    User.shift_start_time, User.shift_end_time,
+    User.works_monday, User.works_tuesday, User.works_wednesday, User.works_thursday,
+    User.works_friday, User.works_saturday, User.works_sunday,
+    # Job assignment
+    User.assigned_job_site_id, User.assignment_accepted,
+    User.assignment_date, User.assigned_at,
+)
+
+
+class AssignedJobOut(BaseModel):
+    """A worker's current job assignment"""
+    job_site_id: int
+    job_site_name: str
+    job_site_address: str
+    accepted: Optional[bool] = None
+    assignment_date: Optional[date] = None
+    assigned_at: Optional[datetime] = None
+
+
+class ClockInOut(BaseModel):
+    """A worker's open clock-in"""
+    clock_in_time: datetime
+    job_site_id: Optional[int] = None
+
+
+class WorkerOut(BaseModel):
+    """Worker row as returned to the admin dashboard"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    email: str
+    first_name: str
+    surname: str
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    suburb: Optional[str] = None
+    state: Optional[str] = None
+    postcode: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    start_date: Optional[date] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    emergency_contact_relationship: Optional[str] = None
+    base_pay_rate: float = 0
+    overtime_pay_rate: float = 0
+    weekend_pay_rate: float = 0
+    night_pay_rate: float = 0
+    employment_type: str = "casual"
+    role: UserRole = UserRole.WORKER
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    # Shift schedule fields
+    shift_start_time: Optional[time] = None
+    shift_end_time: Optional[time] = None
+    works_monday: Optional[bool] = None
+    works_tuesday: Optional[bool] = None
+    works_wednesday: Optional[bool] = None
+    works_thursday: Optional[bool] = None
+    works_friday: Optional[bool] = None
+    works_saturday: Optional[bool] = None
+    works_sunday: Optional[bool] = None
+    # Job assignment and clock-in status
+    assigned_job: Optional[AssignedJobOut] = None
+    clock_in_info: Optional[ClockInOut] = None
+
+    @computed_field
+    @property
+    def is_clocked_in(self) -> bool:
+        return self.clock_in_info is not None
+
+    @field_serializer("shift_start_time", "shift_end_time")
+    def format_shift_time(self, value: Optional[time]) -> Optional[str]:
+        return value.strftime("%H:%M") if value else None
+
+
+# Rows fetched per round-trip when streaming the worker list
+WORKER_STREAM_BATCH = 200
+
+# Active clock-ins (entries with clock_in but no clock_out), joined to their
+# timesheet for the worker id. Ranked so each worker joins at most one row -
+# their most recent open entry.
+ACTIVE_CLOCK_INS = (
+    select(
+        Timesheet.worker_id,
+        TimesheetEntry.clock_in_time,
+        TimesheetEntry.job_site_id,
+        func.row_number().over(
+            partition_by=Timesheet.worker_id,
+            order_by=TimesheetEntry.clock_in_time.desc(),
+        ).label("rank"),
+    )
+    .join(TimesheetEntry, TimesheetEntry.timesheet_id == Timesheet.id)
+    .where(
+        TimesheetEntry.clock_in_time.isnot(None),
+        TimesheetEntry.clock_out_time.is_(None)
+    )
+    .cte("active_clock_ins")
+)
+
+
+def encode_worker_cursor(row) -> str:
+    """Opaque keyset cursor for the (surname, first_name, id) sort order"""
+    return base64.urlsafe_b64encode(orjson.dumps([row.surname, row.first_name, row.id])).decode()
+
+
+def decode_worker_cursor(cursor: str) -> tuple:
+    try:
+        surname, first_name, worker_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        worker_id = int(worker_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Reject here - a bad bind type would only fail once the response is streaming
+    if not isinstance(surname, str) or not isinstance(first_name, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return surname, first_name, worker_id
+
+
+def worker_row_out(u) -> WorkerOut:
+    """Build the dashboard view of one worker row"""
+    # Every column is selected explicitly in WORKER_LIST_COLUMNS, so rows
+    # always carry the assignment fields
+    assigned_job = None
+    if u.assigned_job_site_id:
+        assigned_job = {
+            "job_site_id": u.assigned_job_site_id,
+            "job_site_name": u.job_site_name if u.job_site_name is not None else "Unknown",
+            "job_site_address": u.job_site_address if u.job_site_address is not None else "",
+            "accepted": u.assignment_accepted,
+            "assignment_date": u.assignment_date,
+            "assigned_at": u.assigned_at
+        }
+    
+    # Check clock-in status
+    clock_in_info = None
+    if u.clock_in_time is not None:
+        clock_in_info = {
+            "clock_in_time": u.clock_in_time,
+            "job_site_id": u.clock_in_job_site_id
+        }
+    
+    return WorkerOut.model_validate({
+        **u._mapping,
+        "assigned_job": assigned_job,
+        "clock_in_info": clock_in_info,
+    })
+
+
+async def count_rows(query) -> Optional[int]:
+    """Run a COUNT query on its own pooled connection (None skips it)"""
+    if query is None:
+        return None
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(query)
+        return result.scalar_one()
+
+
+async def stream_workers(query, limit: Optional[int], count_query=None):
+    """Encode the worker list as JSON incrementally, one batch of rows at a time"""
+    # FastAPI closes Depends(get_db) sessions before a streamed body is sent,
+    # so the generator owns its session
+    async with AsyncSessionLocal() as db:
+        # The page count runs alongside on its own connection. Worker rows are
+        # pulled from the server in batches rather than all at once.
+        result, total = await asyncio.gather(
+            db.stream(query.execution_options(yield_per=WORKER_STREAM_BATCH)),
+            count_rows(count_query),
+        )
+        
+        yield b'{"workers":['
+        sent = 0
+        last_row = None
+        next_cursor = None
+        async for rows in result.partitions():
+            chunk = []
+            for u in rows:
+                # The query fetches one row past the page to detect a next page
+                if limit and sent == limit:
+                    next_cursor = encode_worker_cursor(last_row)
+                    break
+                # Serialized straight to JSON by pydantic-core, no intermediate dict
+                chunk.append(worker_row_out(u).model_dump_json().encode())
+                last_row = u
+                sent += 1
+            if chunk:
+                yield (b"," if sent > len(chunk) else b"") + b",".join(chunk)
+        
+        yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b',"total":' + orjson.dumps(total) + b"}"
+
+
 @router.get("/admin/workers")
 async def list_all_workers(
     active_only: bool = True,
-    db: AsyncSession = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None
 ):
-    """List all workers for admin dashboard with assignment and clock-in status"""
-    from sqlalchemy.orm import selectinload
-    
-    query = select(User)
+    """
+    List all workers for admin dashboard with assignment and clock-in status.
+    Pass `limit` to page through results; follow `next_cursor` for the next page.
+    Paged responses also include `total`, the number of matching workers.
+    """
+    # Only pull the columns the dashboard renders - skips ORM instance construction.
+    # Job sites and open clock-ins are joined in so the whole view is one query
+    # and rows can be encoded as they stream.
+    query = (
+        select(
+            *WORKER_LIST_COLUMNS,
+            JobSite.name.label("job_site_name"),
+            JobSite.address.label("job_site_address"),
+            ACTIVE_CLOCK_INS.c.clock_in_time,
+            ACTIVE_CLOCK_INS.c.job_site_id.label("clock_in_job_site_id"),
+        )
+        .outerjoin(JobSite, JobSite.id == User.assigned_job_site_id)
+        .outerjoin(
+            ACTIVE_CLOCK_INS,
+            and_(ACTIVE_CLOCK_INS.c.worker_id == User.id, ACTIVE_CLOCK_INS.c.rank == 1),
+        )
+    )
+    count_query = select(func.count()).select_from(User)
     if active_only:
         query = query.where(User.is_active == True)
+        count_query = count_query.where(User.is_active == True)
     
-    result = await db.execute(query.order_by(User.surname, User.first_name))
-    users = result.scalars().all()
-    
-    # Get all active clock-ins (entries with clock_in but no clock_out)
-    today = date.today()
-    active_entries_result = await db.execute(
-        select(TimesheetEntry)
-        .where(
-            TimesheetEntry.clock_in_time.isnot(None),
-            TimesheetEntry.clock_out_time.is_(None)
+    # Keyset pagination - id breaks ties so the sort order is total
+    if cursor:
+        query = query.where(
+            tuple_(User.surname, User.first_name, User.id) > decode_worker_cursor(cursor)
         )
+    query = query.order_by(User.surname, User.first_name, User.id)
+    if limit:
+        query = query.limit(limit + 1)
+    
+    # Rows are encoded with orjson as they arrive, so peak memory doesn't grow
+    # with the number of workers
+    return StreamingResponse(
+        stream_workers(query, limit, count_query if limit else None),
+        media_type="application/json",
     )
-    active_entries = active_entries_result.scalars().all()
-    
-    # Create a map of user_id to their active entry (via timesheet)
-    from ..models import Timesheet
-    clocked_in_users = {}
-    for entry in active_entries:
-        # Get the timesheet to find user_id
-        ts_result = await db.execute(
-            select(Timesheet).where(Timesheet.id == entry.timesheet_id)
-        )
-        ts = ts_result.scalar_one_or_none()
-        if ts:
-            clocked_in_users[ts.worker_id] = {
-                "clock_in_time": entry.clock_in_time.isoformat() if entry.clock_in_time else None,
-                "job_site_id": entry.job_site_id
-            }
-    
-    # Get job site names for assigned workers
-    job_site_ids = [u.assigned_job_site_id for u in users if hasattr(u, 'assigned_job_site_id') and u.assigned_job_site_id]
-    job_sites_map = {}
-    if job_site_ids:
-        js_result = await db.execute(select(JobSite).where(JobSite.id.in_(job_site_ids)))
-        for js in js_result.scalars().all():
-            job_sites_map[js.id] = {"name": js.name, "address": js.address}
-    
-    workers_data = []
-    for u in users:
-        # Check for assignment info
-        assigned_job = None
-        if hasattr(u, 'assigned_job_site_id') and u.assigned_job_site_id:
-            js_info = job_sites_map.get(u.assigned_job_site_id, {})
-            assigned_job = {
-                "job_site_id": u.assigned_job_site_id,
-                "job_site_name": js_info.get("name", "Unknown"),
-                "job_site_address": js_info.get("address", ""),
-                "accepted": getattr(u, 'assignment_accepted', None),
-                "assignment_date": u.assignment_date.isoformat() if hasattr(u, 'assignment_date') and u.assignment_date else None,
-                "assigned_at": u.assigned_at.isoformat() if hasattr(u, 'assigned_at') and u.assigned_at else None
-            }
-        
-        # Check clock-in status
-        clock_in_status = clocked_in_users.get(u.id)
-        
-        workers_data.append({
-            "id": u.id,
-            "email": u.email,
-            "first_name": u.first_name,
-            "surname": u.surname,
-            "phone": u.phone,
-            "address": u.address,
-            "suburb": u.suburb,
-            "state": u.state,
-            "postcode": u.postcode,
-            "date_of_birth": u.date_of_birth.isoformat() if u.date_of_birth else None,
-            "start_date": u.start_date.isoformat() if u.start_date else None,
-            "emergency_contact_name": u.emergency_contact_name,
-            "emergency_contact_phone": u.emergency_contact_phone,
-            "emergency_contact_relationship": u.emergency_contact_relationship,
-            "bank_account_name": u.bank_account_name,
-            "bank_bsb": u.bank_bsb,
-            "bank_account_number": u.bank_account_number,
-            "tax_file_number": u.tax_file_number,
-            "base_pay_rate": u.base_pay_rate or 0,
-            "overtime_pay_rate": u.overtime_pay_rate or 0,
-            "weekend_pay_rate": u.weekend_pay_rate or 0,
-            "night_pay_rate": u.night_pay_rate or 0,
-            "employment_type": u.employment_type or "casual",
-            "role": u.role.value if u.role else "worker",
-            "is_active": u.is_active,
-            "created_at": u.created_at.isoformat() if u.created_at else None,
-            # Shift schedule fields
-            "shift_start_time": u.shift_start_time.strftime("%H:%M") if u.shift_start_time else None,
-            "shift_end_time": u.shift_end_time.strftime("%H:%M") if u.shift_end_time else None,
-            "works_monday": u.works_monday,
-            "works_tuesday": u.works_tuesday,
-            "works_wednesday": u.works_wednesday,
-            "works_thursday": u.works_thursday,
-            "works_friday": u.works_friday,
-            "works_saturday": u.works_saturday,
-            "works_sunday": u.works_sunday,
-            # New: Job assignment
-            "assigned_job": assigned_job,
-            # New: Clock-in status
-            "is_clocked_in": clock_in_status is not None,
-            "clock_in_info": clock_in_status
-        })
-    
-    return {"workers": workers_data}
 
 
 @router.get("/admin/workers/{worker_id}")
-async def get_worker(
-    worker_id: int,
-    db: AsyncSession = Depends(get_db)
-):
+async def get_worker(worker_id: int):
     """Get single worker details"""
-    result = await db.execute(select(User).where(User.id == worker_id))
-    u = result.scalar_one_or_none()
+    cache_key = user_cache_key(worker_id, "worker")
+    cached = await get_cached(cache_key)
+    if cached:
+        return Response(content=cached, media_type="application/json")
+    
+    # Hold a pooled connection only for the lookup, not for encoding and caching
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(USER_BY_ID, {"user_id": worker_id})
+        u = result.scalar_one_or_none()
     
     if not u:
         raise HTTPException(status_code=404, detail="Worker not found")
     
-    return {
+    payload = orjson.dumps({
         "id": u.id,
         "email": u.email,
         "first_name": u.first_name,
@@ -291,8 +510,8 @@ async def get_worker(
         "suburb": u.suburb,
         "state": u.state,
         "postcode": u.postcode,
-        "date_of_birth": u.date_of_birth.isoformat() if u.date_of_birth else None,
-        "start_date": u.start_date.isoformat() if u.start_date else None,
+        "date_of_birth": u.date_of_birth,
+        "start_date": u.start_date,
         "emergency_contact_name": u.emergency_contact_name,
         "emergency_contact_phone": u.emergency_contact_phone,
         "emergency_contact_relationship": u.emergency_contact_relationship,
@@ -305,9 +524,12 @@ async def get_worker(
         "weekend_pay_rate": u.weekend_pay_rate or 0,
         "night_pay_rate": u.night_pay_rate or 0,
         "employment_type": u.employment_type or "casual",
-        "role": u.role.value if u.role else "worker",
+        "role": u.role or UserRole.WORKER,
         "is_active": u.is_active
-    }
+    })
+    await set_cached(cache_key, payload)
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/admin/workers")
@@ -316,55 +538,94 @@ async def create_worker(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new worker"""
-    # Check if email already exists
-    existing = await db.execute(select(User).where(User.email == worker.email))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
     # Generate a random password (worker will need to reset)
     temp_password = secrets.token_urlsafe(12)
-    hashed = hashlib.sha256(temp_password.encode()).hexdigest()
-    
-    new_worker = User(
-        email=worker.email,
-        hashed_password=hashed,
-        first_name=worker.first_name,
-        surname=worker.surname,
-        phone=worker.phone,
-        address=worker.address,
-        suburb=worker.suburb,
-        state=worker.state,
-        postcode=worker.postcode,
-        date_of_birth=worker.date_of_birth,
-        start_date=worker.start_date,
-        emergency_contact_name=worker.emergency_contact_name,
-        emergency_contact_phone=worker.emergency_contact_phone,
-        emergency_contact_relationship=worker.emergency_contact_relationship,
-        bank_account_name=worker.bank_account_name,
-        bank_bsb=worker.bank_bsb,
-        bank_account_number=worker.bank_account_number,
-        tax_file_number=worker.tax_file_number,
-        base_pay_rate=worker.base_pay_rate or 0,
-        overtime_pay_rate=worker.overtime_pay_rate or 0,
-        weekend_pay_rate=worker.weekend_pay_rate or 0,
-        night_pay_rate=worker.night_pay_rate or 0,
-        employment_type=worker.employment_type or "casual",
-        role=UserRole(worker.role) if worker.role else UserRole.WORKER,
-        is_active=True
+    
+    # Hash on the thread pool while the session checks out (and pre-pings)
+    # its pooled connection - neither depends on the other
+    async with asyncio.TaskGroup() as tg:
+        hash_task = tg.create_task(hash_password_async(temp_password))
+        tg.create_task(db.connection())
+    hashed = hash_task.result()
+    
+    # Single round-trip - the unique index on email rejects duplicates
+    result = await db.execute(
+        insert(User)
+        .values(**worker_insert_values(worker, hashed))
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id)
     )
+    new_worker_id = result.scalar_one_or_none()
+    if new_worker_id is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
-    db.add(new_worker)
     await db.commit()
-    await db.refresh(new_worker)
     
     return {
-        "id": new_worker.id,
-        "email": new_worker.email,
+        "id": new_worker_id,
+        "email": worker.email,
         "temp_password": temp_password,  # Return this so admin can share with worker
         "message": "Worker created. Share the temporary password with them to log in."
     }
 
 
+# Largest crew accepted in one bulk upload
+MAX_BULK_WORKERS = 200
+
+
+class BulkWorkerCreate(BaseModel):
+    workers: list[WorkerCreate] = Field(max_length=MAX_BULK_WORKERS)
+
+
+# Returns plaintext temporary passwords, so it needs the admin dashboard token
+@router.post("/admin/workers/bulk", dependencies=[Depends(require_admin_token)])
+async def create_workers_bulk(
+    data: BulkWorkerCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a crew of workers in one request"""
+    # Drop repeated emails within the upload (first one wins)
+    workers = {}
+    for worker in data.workers:
+        workers.setdefault(worker.email, worker)
+    workers = list(workers.values())
+    
+    if not workers:
+        return {"created": [], "skipped": []}
+    
+    # Hash the temp passwords on the thread pool, a few at a time
+    temp_passwords = generate_temp_passwords(len(workers))
+    hashes = await asyncio.gather(*[hash_password_async(p) for p in temp_passwords])
+    
+    # One multi-row INSERT - existing emails are skipped rather than failing the batch
+    result = await db.execute(
+        insert(User)
+        .values([worker_insert_values(w, h) for w, h in zip(workers, hashes)])
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id, User.email)
+    )
+    created_ids = {row.email: row.id for row in result.all()}
+    await db.commit()
+    
+    created = []
+    skipped = []
+    for worker, temp_password in zip(workers, temp_passwords):
+        if worker.email in created_ids:
+            created.append({
+                "id": created_ids[worker.email],
+                "email": worker.email,
+                "temp_password": temp_password,
+            })
+        else:
+            skipped.append(worker.email)
+    
+    return {
+        "created": created,
+        "skipped": skipped,
+        "message": f"{len(created)} workers created" + (f", {len(skipped)} already registered" if skipped else "")
+    }
+
+
 @router.put("/admin/workers/{worker_id}")
 async def update_worker(
     worker_id: int,
@@ -372,21 +633,22 @@ async def update_worker(
     db: AsyncSession = Depends(get_db)
 ):
     """Update worker details"""
-    result = await db.execute(select(User).where(User.id == worker_id))
-    worker = result.scalar_one_or_none()
+    # Update only provided fields
+    update_data = worker_data.model_dump(exclude_unset=True, exclude_none=True)
+    if "role" in update_data:
+        update_data["role"] = UserRole(update_data["role"])
     
-    if not worker:
-        raise HTTPException(status_code=404, detail="Worker not found")
+    if update_data:
+        found = await update_user_fields(db, worker_id, **update_data)
+    else:
+        # Nothing to change - just confirm the worker exists
+        found = await db.scalar(select(User.id).where(User.id == worker_id)) is not None
     
-    # Update only provided fields
-    update_data = worker_data.dict(exclude_unset=True, exclude_none=True)
-    for field, value in update_data.items():
-        if field == "role":
-            setattr(worker, field, UserRole(value))
-        else:
-            setattr(worker, field, value)
+    if not found:
+        raise HTTPException(status_code=404, detail="Worker not found")
     
     await db.commit()
+    await invalidate_user(worker_id)
     
     return {"message": "Worker updated successfully"}
 
@@ -397,14 +659,11 @@ async def activate_worker(
     db: AsyncSession = Depends(get_db)
 ):
     """Activate a worker"""
-    result = await db.execute(select(User).where(User.id == worker_id))
-    worker = result.scalar_one_or_none()
-    
-    if not worker:
+    if not await update_user_fields(db, worker_id, is_active=True):
         raise HTTPException(status_code=404, detail="Worker not found")
     
-    worker.is_active = True
     await db.commit()
+    await invalidate_user(worker_id)
     
     return {"message": "Worker activated"}
 
@@ -415,14 +674,11 @@ async def deactivate_worker_admin(
     db: AsyncSession = Depends(get_db)
 ):
     """Deactivate a worker"""
-    result = await db.execute(select(User).where(User.id == worker_id))
-    worker = result.scalar_one_or_none()
-    
-    if not worker:
+    if not await update_user_fields(db, worker_id, is_active=False):
         raise HTTPException(status_code=404, detail="Worker not found")
     
-    worker.is_active = False
     await db.commit()
+    await invalidate_user(worker_id)
     
     return {"message": "Worker deactivated"}
 
@@ -433,16 +689,12 @@ async def reset_worker_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Reset worker password and return new temporary password"""
-    result = await db.execute(select(User).where(User.id == worker_id))
-    worker = result.scalar_one_or_none()
-    
-    if not worker:
-        raise HTTPException(status_code=404, detail="Worker not found")
-    
     # Generate new temporary password
     temp_password = secrets.token_urlsafe(12)
-    worker.hashed_password = hashlib.sha256(temp_password.encode()).hexdigest()
+    hashed = await hash_password_async(temp_password)
     
+    if not await update_user_fields(db, worker_id, hashed_password=hashed):
+        raise HTTPException(status_code=404, detail="Worker not found")
     await db.commit()
     
     return {
@@ -451,6 +703,14 @@ async def reset_worker_password(
     }
 
 
+# Columns returned by the schedule endpoint
+SCHEDULE_COLUMNS = (
+    User.shift_start_time, User.shift_end_time,
+    User.works_monday, User.works_tuesday, User.works_wednesday, User.works_thursday,
+    User.works_friday, User.works_saturday, User.works_sunday,
+)
+
+
 class ShiftScheduleUpdate(BaseModel):
     shift_start_time: Optional[str] = None  # HH:MM format
     shift_end_time: Optional[str] = None    # HH:MM format
@@ -470,37 +730,28 @@ async def update_worker_schedule(
     db: AsyncSession = Depends(get_db)
 ):
     """Update worker shift schedule for SMS reminders"""
-    from datetime import datetime as dt
-    
-    result = await db.execute(select(User).where(User.id == worker_id))
-    worker = result.scalar_one_or_none()
+    values = schedule.model_dump(exclude_none=True)
+    
+    # Parse shift times - blank strings leave the current time unchanged
+    for field in ("shift_start_time", "shift_end_time"):
+        if field in values:
+            raw = values.pop(field)
+            if raw:
+                values[field] = datetime.strptime(raw, "%H:%M").time()
+    
+    # Write and read back the schedule in one round-trip
+    if values:
+        query = update(User).where(User.id == worker_id).values(**values).returning(*SCHEDULE_COLUMNS)
+    else:
+        query = select(*SCHEDULE_COLUMNS).where(User.id == worker_id)
+    result = await db.execute(query)
+    worker = result.one_or_none()
     
     if not worker:
         raise HTTPException(status_code=404, detail="Worker not found")
     
-    # Update shift times
-    if schedule.shift_start_time:
-        worker.shift_start_time = dt.strptime(schedule.shift_start_time, "%H:%M").time()
-    if schedule.shift_end_time:
-        worker.shift_end_time = dt.strptime(schedule.shift_end_time, "%H:%M").time()
-    
-    # Update work days
-    if schedule.works_monday is not None:
-        worker.works_monday = schedule.works_monday
-    if schedule.works_tuesday is not None:
-        worker.works_tuesday = schedule.works_tuesday
-    if schedule.works_wednesday is not None:
-        worker.works_wednesday = schedule.works_wednesday
-    if schedule.works_thursday is not None:
-        worker.works_thursday = schedule.works_thursday
-    if schedule.works_friday is not None:
-        worker.works_friday = schedule.works_friday
-    if schedule.works_saturday is not None:
-        worker.works_saturday = schedule.works_saturday
-    if schedule.works_sunday is not None:
-        worker.works_sunday = schedule.works_sunday
-    
     await db.commit()
+    await invalidate_user(worker_id)
     
     return {
         "message": "Schedule updated",
@@ -530,34 +781,46 @@ async def assign_worker_to_job(
     db: AsyncSession = Depends(get_db)
 ):
     """Assign a worker to a job site"""
-    result = await db.execute(select(User).where(User.id == worker_id))
-    worker = result.scalar_one_or_none()
-    
-    if not worker:
-        raise HTTPException(status_code=404, detail="Worker not found")
-    
     if assignment.job_site_id:
-        # Verify job site exists
-        js_result = await db.execute(select(JobSite).where(JobSite.id == assignment.job_site_id))
-        job_site = js_result.scalar_one_or_none()
-        if not job_site:
-            raise HTTPException(status_code=404, detail="Job site not found")
+        # Check the job site, assign the worker and read back the site name in
+        # one statement - nothing is updated if the job site doesn't exist
+        site_name = select(JobSite.name).where(JobSite.id == assignment.job_site_id).scalar_subquery()
+        result = await db.execute(
+            update(User)
+            .where(User.id == worker_id, exists().where(JobSite.id == assignment.job_site_id))
+            .values(
+                assigned_job_site_id=assignment.job_site_id,
+                assignment_date=assignment.assignment_date or date.today(),
+                assignment_accepted=None,  # Reset acceptance status
+                assigned_at=utcnow(),
+            )
+            .returning(site_name)
+        )
+        job_site_name = result.scalar_one_or_none()
         
-        worker.assigned_job_site_id = assignment.job_site_id
-        worker.assignment_date = assignment.assignment_date or date.today()
-        worker.assignment_accepted = None  # Reset acceptance status
-        worker.assigned_at = datetime.utcnow()
+        if job_site_name is None:
+            # Nothing matched - work out which id was wrong
+            worker = await db.execute(select(User.id).where(User.id == worker_id))
+            if worker.scalar_one_or_none() is None:
+                raise HTTPException(status_code=404, detail="Worker not found")
+            raise HTTPException(status_code=404, detail="Job site not found")
         
-        message = f"Worker assigned to {job_site.name}"
+        message = f"Worker assigned to {job_site_name}"
     else:
         # Clear assignment
-        worker.assigned_job_site_id = None
-        worker.assignment_date = None
-        worker.assignment_accepted = None
-        worker.assigned_at = None
+        cleared = await update_user_fields(
+            db, worker_id,
+            assigned_job_site_id=None,
+            assignment_date=None,
+            assignment_accepted=None,
+            assigned_at=None,
+        )
+        if not cleared:
+            raise HTTPException(status_code=404, detail="Worker not found")
         message = "Assignment cleared"
     
     await db.commit()
+    await invalidate_user(worker_id)
     
     return {"message": message}
 
@@ -571,27 +834,34 @@ async def assign_workers_bulk(
 ):
     """Assign multiple workers to a job site"""
     # Verify job site exists
-    js_result = await db.execute(select(JobSite).where(JobSite.id == job_site_id))
-    job_site = js_result.scalar_one_or_none()
-    if not job_site:
+    js_result = await db.execute(select(JobSite.name).where(JobSite.id == job_site_id))
+    job_site_name = js_result.scalar_one_or_none()
+    if job_site_name is None:
         raise HTTPException(status_code=404, detail="Job site not found")
     
-    # Get all workers
-    result = await db.execute(select(User).where(User.id.in_(worker_ids)))
-    workers = result.scalars().all()
-    
-    assigned_count = 0
-    for worker in workers:
-        worker.assigned_job_site_id = job_site_id
-        worker.assignment_date = assignment_date or date.today()
-        worker.assignment_accepted = None
-        worker.assigned_at = datetime.utcnow()
-        assigned_count += 1
-    
+    # Deduplicated and sorted so the IN list stays small and concurrent
+    # bulk assignments lock rows in the same order
+    worker_ids = sorted(set(worker_ids))
+    
+    # Assign every worker in one statement - ids that don't exist simply don't match
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(worker_ids))
+        .values(
+            assigned_job_site_id=job_site_id,
+            assignment_date=assignment_date or date.today(),
+            assignment_accepted=None,
+            assigned_at=utcnow(),
+        )
+        .returning(User.id)
+    )
+    assigned_ids = result.scalars().all()
     await db.commit()
+    await invalidate_users(assigned_ids)
     
+    assigned_count = len(assigned_ids)
     return {
-        "message": f"{assigned_count} workers assigned to {job_site.name}",
+        "message": f"{assigned_count} workers assigned to {job_site_name}",
         "assigned_count": assigned_count
     }
 
@@ -608,17 +878,22 @@ async def respond_to_assignment(
     db: AsyncSession = Depends(get_db)
 ):
     """Worker accepts or declines their job assignment"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    worker = result.scalar_one_or_none()
-    
-    if not worker:
-        raise HTTPException(status_code=404, detail="Worker not found")
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.assigned_job_site_id.is_not(None))
+        .values(assignment_accepted=response.accepted)
+        .returning(User.id)
+    )
     
-    if not worker.assigned_job_site_id:
+    if result.scalar_one_or_none() is None:
+        # Only pay for the extra lookup on the error path
+        exists = await db.execute(select(User.id).where(User.id == user_id))
+        if exists.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Worker not found")
         raise HTTPException(status_code=400, detail="No job assignment to respond to")
     
-    worker.assignment_accepted = response.accepted
     await db.commit()
+    await invalidate_user(user_id)
     
     return {
         "message": "Job accepted" if response.accepted else "Job declined",
@@ -632,70 +907,72 @@ async def get_worker_assignment(
     db: AsyncSession = Depends(get_db)
 ):
     """Get worker's current job assignment (for mobile app)"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    worker = result.scalar_one_or_none()
+    # Worker and job site in one round-trip
+    result = await db.execute(
+        select(
+            User.assignment_date,
+            User.assigned_at,
+            User.assignment_accepted,
+            JobSite.id.label("job_site_id"),
+            JobSite.name.label("job_site_name"),
+            JobSite.address.label("job_site_address"),
+        )
+        .select_from(User)
+        .outerjoin(JobSite, JobSite.id == User.assigned_job_site_id)
+        .where(User.id == user_id)
+    )
+    row = result.one_or_none()
     
-    if not worker:
+    if not row:
         raise HTTPException(status_code=404, detail="Worker not found")
     
-    if not worker.assigned_job_site_id:
-        return {"assignment": None}
-    
-    # Get job site details
-    js_result = await db.execute(select(JobSite).where(JobSite.id == worker.assigned_job_site_id))
-    job_site = js_result.scalar_one_or_none()
-    
-    if not job_site:
+    # No assignment, or the assigned job site no longer exists
+    if row.job_site_id is None:
         return {"assignment": None}
     
     return {
         "assignment": {
-            "job_site_id": job_site.id,
-            "job_site_name": job_site.name,
-            "job_site_address": job_site.address,
-            "assignment_date": worker.assignment_date.isoformat() if worker.assignment_date else None,
-            "assigned_at": worker.assigned_at.isoformat() if worker.assigned_at else None,
-            "accepted": worker.assignment_accepted
+            "job_site_id": row.job_site_id,
+            "job_site_name": row.job_site_name,
+            "job_site_address": row.job_site_address,
+            "assignment_date": row.assignment_date,
+            "assigned_at": row.assigned_at,
+            "accepted": row.assignment_accepted
         }
     }
 
 
 # ==================== ORIGINAL ADMIN AUTH ENDPOINTS ====================
 
-@router.patch("/{user_id}/role")
+@admin_router.patch("/{user_id}/role")
 async def update_user_role(
     user_id: int,
     role: str,
-    current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a user's role (admin only)"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
-    if not user:
+    if not await update_user_fields(db, user_id, role=UserRole(role)):
         raise HTTPException(status_code=404, detail="User not found")
     
-    user.role = UserRole(role)
     await db.commit()
+    await invalidate_user(user_id)
     
     return {"message": f"User role updated to {role}"}
 
 
-@router.patch("/{user_id}/deactivate")
+@admin_router.patch("/{user_id}/deactivate")
 async def deactivate_user(
     user_id: int,
-    current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Deactivate a user (admin only)"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
-    if not user:
+    if not await update_user_fields(db, user_id, is_active=False):
         raise HTTPException(status_code=404, detail="User not found")
     
-    user.is_active = False
     await db.commit()
+    await invalidate_user(user_id)
     
     return {"message": "User deactivated"}
+
+
+router.include_router(admin_router)
@@ -0,0 +1,112 @@
+"""
+RAW Labour Hire - Response Cache
+Redis read-through cache for hot single-row lookups
+"""
+
+import logging
+import os
+from typing import Optional
+
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Redis configuration from environment variables - caching is off when unset
+REDIS_URL = os.getenv("REDIS_URL")
+
+# How long cached user payloads live (seconds) - every write path invalidates
+USER_CACHE_TTL = 300
+
+# Authenticated-user lookups are re-checked against the database more often
+AUTH_CACHE_TTL = 60
+
+# Shared connection pool size
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+
+# Each cached rendering of a user row - all are dropped when the user changes
+USER_CACHE_VIEWS = ("profile", "worker", "auth")
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """Get the shared Redis client if REDIS_URL is configured"""
+    global _client
+    if not REDIS_URL:
+        return None
+    if _client is None:
+        pool = redis.ConnectionPool.from_url(REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS)
+        _client = redis.Redis(connection_pool=pool)
+    return _client
+
+
+async def init_cache():
+    """Open the Redis pool at startup so the first request doesn't pay for it"""
+    client = get_redis_client()
+    if not client:
+        logger.info("Redis not configured - response caching disabled")
+        return
+    try:
+        await client.ping()
+        logger.info("Connected to Redis")
+    except RedisError as e:
+        logger.warning("Redis unavailable, falling back to database: %s", e)
+
+
+async def close_cache():
+    """Close the Redis pool on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def user_cache_key(user_id: int, view: str) -> str:
+    """Cache key for one rendering of a user, e.g. user:42:profile"""
+    return f"user:{user_id}:{view}"
+
+
+async def get_cached(key: str) -> Optional[bytes]:
+    """Return the cached payload, or None on a miss or if Redis is unavailable"""
+    client = get_redis_client()
+    if not client:
+        return None
+    try:
+        return await client.get(key)
+    except RedisError as e:
+        logger.warning("Error reading %s: %s", key, e)
+        return None
+
+
+async def set_cached(key: str, payload: bytes, ttl: int = USER_CACHE_TTL):
+    """Store an already-encoded payload"""
+    client = get_redis_client()
+    if not client:
+        return
+    try:
+        await client.set(key, payload, ex=ttl)
+    except RedisError as e:
+        logger.warning("Error writing %s: %s", key, e)
+
+
+async def invalidate_user(user_id: int):
+    """Drop every cached rendering of a user after it changes"""
+    client = get_redis_client()
+    if not client:
+        return
+    try:
+        await client.delete(*[user_cache_key(user_id, view) for view in USER_CACHE_VIEWS])
+    except RedisError as e:
+        logger.warning("Error invalidating user %s: %s", user_id, e)
+
+
+async def invalidate_users(user_ids):
+    """Drop cached renderings for many users in a single round-trip"""
+    client = get_redis_client()
+    if not client or not user_ids:
+        return
+    try:
+        await client.delete(*[user_cache_key(user_id, view) for user_id in user_ids for view in USER_CACHE_VIEWS])
+    except RedisError as e:
+        logger.warning("Error invalidating %d users: %s", len(user_ids), e)
@@ -4,71 +4,144 @@ Sends clock-in/out reminders at configured times
 """
 
 import asyncio
+import functools
+import logging
+import os
 from datetime import datetime
+from zoneinfo import ZoneInfo
+from apscheduler.events import EVENT_JOB_MISSED
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import pytz
+
+from ..database import AsyncSessionLocal, DATABASE_URL
+from ..routes.notifications import send_clock_in_reminders, send_clock_out_reminders
+
+logger = logging.getLogger(__name__)
 
 # Australian Eastern timezone
-TIMEZONE = pytz.timezone('Australia/Sydney')
+TIMEZONE = ZoneInfo('Australia/Sydney')
+
+# Keep job state in the database so run history survives restarts
+PERSISTENT_JOBS = os.getenv("APSCHEDULER_PERSISTENT", "").lower() in ("1", "true")
+
+
+def build_jobstores() -> dict:
+    """Database job store when persistence is enabled, otherwise in-memory"""
+    if not PERSISTENT_JOBS:
+        return {}
+    # APScheduler's job store is synchronous - use the sync driver for the same database
+    sync_url = DATABASE_URL.replace("+asyncpg", "+psycopg2").replace("+aiosqlite", "")
+    return {"default": SQLAlchemyJobStore(url=sync_url, tablename="apscheduler_jobs")}
+
+
+# Jobs are coroutine functions run on the event loop by the asyncio executor:
+# one run at a time, missed runs collapse into one, and a run up to 10 minutes
+# late still fires
+scheduler = AsyncIOScheduler(
+    timezone=TIMEZONE,
+    jobstores=build_jobstores(),
+    executors={"default": AsyncIOExecutor()},
+    job_defaults={
+        "max_instances": 1,
+        "coalesce": True,
+        "misfire_grace_time": 600,
+    },
+)
+
+
+# Reminder runs in progress - shutdown waits for these before stopping
+_running_jobs: set = set()
+
+# How long shutdown waits for in-progress reminder runs (seconds)
+SHUTDOWN_TIMEOUT = 30
+
+
+def track_running(func):
+    """Register each run of a job so shutdown can let it finish"""
+    @functools.wraps(func)
+    async def wrapper():
+        task = asyncio.current_task()
+        _running_jobs.add(task)
+        try:
+            await func()
+        finally:
+            _running_jobs.discard(task)
+    return wrapper
 
-scheduler = AsyncIOScheduler(timezone=TIMEZONE)
 
+def log_missed_job(event):
+    """Report reminder runs skipped because they were past the grace window"""
+    logger.warning("Job %s missed its %s run", event.job_id, event.scheduled_run_time)
 
+
+@track_running
 async def check_clock_in_reminders():
     """Check and send clock-in reminders"""
-    from ..database import AsyncSessionLocal
-    from ..routes.notifications import check_clock_in_reminders as send_reminders
-    
-    print(f"[Scheduler] Running clock-in reminder check at {datetime.now(TIMEZONE)}")
+    # One clock reading for the whole run
+    now = datetime.now(TIMEZONE)
+    logger.info("Running clock-in reminder check at %s", now)
     
     try:
         async with AsyncSessionLocal() as db:
-            # Create a mock request-like context
-            result = await send_reminders(db)
-            print(f"[Scheduler] Clock-in reminders result: {result}")
-    except Exception as e:
-        print(f"[Scheduler] Error sending clock-in reminders: {e}")
+            result = await send_clock_in_reminders(db, now)
+            logger.info("Clock-in reminders result: %s", result)
+    except Exception:
+        logger.exception("Error sending clock-in reminders")
 
 
+@track_running
 async def check_clock_out_reminders():
     """Check and send clock-out reminders"""
-    from ..database import AsyncSessionLocal
-    from ..routes.notifications import check_clock_out_reminders as send_reminders
-    
-    print(f"[Scheduler] Running clock-out reminder check at {datetime.now(TIMEZONE)}")
+    now = datetime.now(TIMEZONE)
+    logger.info("Running clock-out reminder check at %s", now)
     
     try:
         async with AsyncSessionLocal() as db:
-            result = await send_reminders(db)
-            print(f"[Scheduler] Clock-out reminders result: {result}")
-    except Exception as e:
-        print(f"[Scheduler] Error sending clock-out reminders: {e}")
+            result = await send_clock_out_reminders(db, now)
+            logger.info("Clock-out reminders result: %s", result)
+    except Exception:
+        logger.exception("Error sending clock-out reminders")
+
+
+def same_trigger(a: CronTrigger, b: CronTrigger) -> bool:
+    """Whether two cron triggers fire on the same schedule"""
+    return str(a) == str(b) and str(a.timezone) == str(b.timezone)
+
+
+def add_reminder_job(func, trigger: CronTrigger, job_id: str, name: str):
+    """Add a reminder job, keeping a persisted one whose schedule is unchanged"""
+    # Replacing an unchanged stored job would recompute its next run and drop
+    # any run missed while the app was down; a changed schedule still applies
+    stored = scheduler.get_job(job_id)
+    if stored and same_trigger(stored.trigger, trigger):
+        return
+    scheduler.add_job(func, trigger, id=job_id, replace_existing=True, name=name)
 
 
 def setup_scheduler():
     """Setup the scheduler with default jobs"""
+    scheduler.add_listener(log_missed_job, EVENT_JOB_MISSED)
+    
     # Clock-in reminder at 7:00 AM Sydney time on weekdays
-    scheduler.add_job(
-        lambda: asyncio.create_task(check_clock_in_reminders()),
+    add_reminder_job(
+        check_clock_in_reminders,
         CronTrigger(hour=7, minute=0, day_of_week='mon-fri', timezone=TIMEZONE),
-        id='clock_in_reminder',
-        replace_existing=True,
-        name='Clock-In Reminder'
+        'clock_in_reminder',
+        'Clock-In Reminder'
     )
     
     # Clock-out reminder at 5:00 PM Sydney time on weekdays
-    scheduler.add_job(
-        lambda: asyncio.create_task(check_clock_out_reminders()),
+    add_reminder_job(
+        check_clock_out_reminders,
         CronTrigger(hour=17, minute=0, day_of_week='mon-fri', timezone=TIMEZONE),
-        id='clock_out_reminder',
-        replace_existing=True,
-        name='Clock-Out Reminder'
+        'clock_out_reminder',
+        'Clock-Out Reminder'
     )
     
-    print("[Scheduler] Automatic reminders scheduled:")
-    print("  - Clock-in reminder: 7:00 AM AEST (Mon-Fri)")
-    print("  - Clock-out reminder: 5:00 PM AEST (Mon-Fri)")
+    for job in scheduler.get_jobs():
+        logger.info("%s scheduled, next run %s", job.name, job.next_run_time)
 
 
 def update_clock_in_time(hour: int, minute: int):
@@ -77,7 +150,7 @@ def update_clock_in_time(hour: int, minute: int):
         'clock_in_reminder',
         trigger=CronTrigger(hour=hour, minute=minute, day_of_week='mon-fri', timezone=TIMEZONE)
     )
-    print(f"[Scheduler] Clock-in reminder rescheduled to {hour:02d}:{minute:02d}")
+    logger.info("Clock-in reminder rescheduled to %02d:%02d", hour, minute)
 
 
 def update_clock_out_time(hour: int, minute: int):
@@ -86,19 +159,30 @@ def update_clock_out_time(hour: int, minute: int):
         'clock_out_reminder',
         trigger=CronTrigger(hour=hour, minute=minute, day_of_week='mon-fri', timezone=TIMEZONE)
     )
-    print(f"[Scheduler] Clock-out reminder rescheduled to {hour:02d}:{minute:02d}")
+    logger.info("Clock-out reminder rescheduled to %02d:%02d", hour, minute)
 
 
 def start_scheduler():
     """Start the scheduler"""
     if not scheduler.running:
+        # Start paused so persisted jobs are loaded before the defaults are added
+        scheduler.start(paused=True)
         setup_scheduler()
-        scheduler.start()
-        print("[Scheduler] Started")
+        scheduler.resume()
+        logger.info("Started")
 
 
-def stop_scheduler():
-    """Stop the scheduler"""
-    if scheduler.running:
-        scheduler.shutdown()
-        print("[Scheduler] Stopped")
+async def stop_scheduler(timeout: float = SHUTDOWN_TIMEOUT):
+    """Stop the scheduler, letting in-progress reminder runs finish first"""
+    if not scheduler.running:
+        return
+    # No new runs start while we wait
+    scheduler.pause()
+    if _running_jobs:
+        logger.info("Waiting for %d running job(s) to finish", len(_running_jobs))
+        _, pending = await asyncio.wait(set(_running_jobs), timeout=timeout)
+        if pending:
+            logger.warning("%d job(s) still running after %ss - cancelling", len(pending), timeout)
+    # The asyncio executor ignores wait= and cancels anything still running
+    scheduler.shutdown(wait=False)
+    logger.info("Stopped")
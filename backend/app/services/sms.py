@@ -3,31 +3,93 @@ RAW Labour Hire - SMS Notification Service
 Uses Twilio for sending SMS messages
 """
 
+import asyncio
+import logging
 import os
-from typing import Optional
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
+import random
+import re
+from functools import lru_cache
+from typing import Optional, List, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
 
 # Twilio configuration from environment variables
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")  # Your Twilio phone number
 
+# Twilio REST API - sending only needs the Messages resource
+TWILIO_API_URL = "https://api.twilio.com/2010-04-01/Accounts/{sid}/"
+TWILIO_TIMEOUT = 10.0  # seconds
+
+# Twilio request limits - API requests started per second, and in-flight requests.
+# Twilio queues accepted messages and sends them at the sender's own rate, so this
+# only paces API calls; a reminder run for N workers takes about N / SMS_MAX_MPS
+# seconds, which the synchronous reminder endpoints have to finish within
+SMS_MAX_MPS = float(os.getenv("TWILIO_MAX_MPS", "10"))
+SMS_MAX_CONCURRENCY = int(os.getenv("TWILIO_MAX_CONCURRENCY", "20"))
+if SMS_MAX_MPS <= 0:
+    raise RuntimeError(f"TWILIO_MAX_MPS must be greater than 0, got {SMS_MAX_MPS}")
+if SMS_MAX_CONCURRENCY < 1:
+    raise RuntimeError(f"TWILIO_MAX_CONCURRENCY must be at least 1, got {SMS_MAX_CONCURRENCY}")
+
+# Retries for throttled (429) or failed (5xx) Twilio requests
+SMS_MAX_ATTEMPTS = 3
+SMS_MAX_BACKOFF = 30  # seconds
+
+# Separators people type in phone numbers: spaces, dashes, brackets
+PHONE_SEPARATORS = re.compile(r"[\s\-()]")
+
+# Australian numbers in E.164 - anything else would only come back as a Twilio 400
+AU_E164_PHONE = re.compile(r"^\+61[234578]\d{8}$")
+
 # Default company name for messages
 COMPANY_NAME = "RAW Labour Hire"
 
+_client: Optional[httpx.AsyncClient] = None
+
 
-def get_twilio_client() -> Optional[Client]:
-    """Get Twilio client if credentials are configured"""
+def get_twilio_client() -> Optional[httpx.AsyncClient]:
+    """Get the shared Twilio HTTP client if credentials are configured"""
+    global _client
     if not all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER]):
-        print("[SMS] Twilio not configured - missing credentials")
+        logger.warning("Twilio not configured - missing credentials")
         return None
     
+    if _client is None:
+        # Pooled HTTP/2 connection - concurrent sends multiplex over it
+        _client = httpx.AsyncClient(
+            http2=True,
+            auth=(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN),
+            base_url=TWILIO_API_URL.format(sid=TWILIO_ACCOUNT_SID),
+            timeout=TWILIO_TIMEOUT,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_sms_client():
+    """Close the Twilio HTTP client on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """Twilio rate limiting or a server-side failure - worth another try"""
+    return status_code == 429 or status_code >= 500
+
+
+def twilio_error_message(response: httpx.Response) -> str:
+    """Error text from a failed Twilio API response"""
     try:
-        return Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-    except Exception as e:
-        print(f"[SMS] Error creating Twilio client: {e}")
-        return None
+        error = response.json()
+        return f"HTTP {response.status_code} error {error.get('code')}: {error.get('message')}"
+    except ValueError:
+        return f"HTTP {response.status_code}: {response.text[:200]}"
 
 
 def format_phone_number(phone: str) -> str:
@@ -35,28 +97,28 @@ def format_phone_number(phone: str) -> str:
     if not phone:
         return ""
     
-    # Remove spaces, dashes, and brackets
-    phone = phone.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+    phone = PHONE_SEPARATORS.sub("", phone)
     
-    # Handle Australian numbers
-    if phone.startswith("04"):
-        # Convert 04xx to +614xx
+    # Australian local numbers (04xx mobile, 0x landline) drop the trunk 0
+    if phone[:1] == "0":
         return "+61" + phone[1:]
-    elif phone.startswith("+61"):
+    # Already international (+61 or another country code)
+    if phone[:1] == "+":
         return phone
-    elif phone.startswith("61"):
+    if phone[:2] == "61":
         return "+" + phone
-    elif phone.startswith("0"):
-        return "+61" + phone[1:]
-    
-    # If already has + prefix, return as is
-    if phone.startswith("+"):
-        return phone
     
     # Default: assume Australian and add +61
     return "+61" + phone
 
 
+# Normalise the sender once so a local-format number (0412...) doesn't fail every send
+if TWILIO_PHONE_NUMBER:
+    TWILIO_PHONE_NUMBER = format_phone_number(TWILIO_PHONE_NUMBER)
+    if not AU_E164_PHONE.match(TWILIO_PHONE_NUMBER):
+        raise RuntimeError(f"TWILIO_PHONE_NUMBER is not a valid Australian number: {TWILIO_PHONE_NUMBER!r}")
+
+
 async def send_sms(to_phone: str, message: str) -> dict:
     """
     Send an SMS message
@@ -78,58 +140,125 @@ async def send_sms(to_phone: str, message: str) -> dict:
     
     formatted_phone = format_phone_number(to_phone)
     
-    if not formatted_phone:
+    if not AU_E164_PHONE.match(formatted_phone):
+        logger.warning("Skipping invalid phone number %r", to_phone)
         return {
             "success": False,
             "error": "Invalid phone number"
         }
     
+    form = {"From": TWILIO_PHONE_NUMBER, "To": formatted_phone, "Body": message}
+    
     try:
-        message_obj = client.messages.create(
-            body=message,
-            from_=TWILIO_PHONE_NUMBER,
-            to=formatted_phone
-        )
+        for attempt in range(SMS_MAX_ATTEMPTS):
+            response = await client.post("Messages.json", data=form)
+            if not response.is_error:
+                break
+            if attempt == SMS_MAX_ATTEMPTS - 1 or not is_retryable_status(response.status_code):
+                error = twilio_error_message(response)
+                logger.error("Twilio error: %s", error)
+                return {
+                    "success": False,
+                    "error": error
+                }
+            # Exponential backoff with jitter so throttled sends spread out
+            delay = min(SMS_MAX_BACKOFF, 2 ** attempt + random.random())
+            logger.warning("Twilio returned %s for %s, retrying in %.1fs", response.status_code, formatted_phone, delay)
+            await asyncio.sleep(delay)
         
-        print(f"[SMS] Sent to {formatted_phone}: {message[:50]}...")
+        logger.info("Sent to %s: %.50s...", formatted_phone, message)
         
         return {
             "success": True,
-            "message_sid": message_obj.sid,
+            "message_sid": response.json()["sid"],
             "to": formatted_phone
         }
     
-    except TwilioRestException as e:
-        print(f"[SMS] Twilio error: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
     except Exception as e:
-        print(f"[SMS] Error sending SMS: {e}")
+        logger.exception("Error sending SMS")
         return {
             "success": False,
             "error": str(e)
         }
 
 
+async def send_bulk_sms(
+    messages: List[Tuple[str, str]],
+    mps: float = SMS_MAX_MPS,
+    concurrency: int = SMS_MAX_CONCURRENCY
+) -> List[dict]:
+    """
+    Send many SMS messages concurrently without exceeding Twilio's rate limit
+    
+    Args:
+        messages: (phone, message) pairs
+        mps: Maximum messages started per second
+        concurrency: Maximum sends in flight at once
+    
+    Returns:
+        send_sms result dicts, in the same order as messages
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    slot_lock = asyncio.Lock()
+    interval = 1 / mps
+    next_slot = loop.time()
+    
+    async def send_one(phone: str, message: str) -> dict:
+        nonlocal next_slot
+        async with semaphore:
+            # Hand out evenly spaced start times
+            async with slot_lock:
+                start = max(next_slot, loop.time())
+                next_slot = start + interval
+            await asyncio.sleep(start - loop.time())
+            return await send_sms(phone, message)
+    
+    results = await asyncio.gather(
+        *[send_one(phone, message) for phone, message in messages],
+        return_exceptions=True
+    )
+    return [
+        {"success": False, "error": str(r)} if isinstance(r, BaseException) else r
+        for r in results
+    ]
+
+
 # ==================== NOTIFICATION TEMPLATES ====================
 
+# Rendered messages are reused - the same workers get the same reminders daily
+TEMPLATE_CACHE_SIZE = 2048
+
+# One GSM-7 SMS segment - longer bodies are split and billed as several messages
+SMS_SEGMENT_LENGTH = 160
+
+
+def single_segment(message: str) -> str:
+    """Truncate a templated message so it is sent and billed as one SMS"""
+    if len(message) <= SMS_SEGMENT_LENGTH:
+        return message
+    return message[:SMS_SEGMENT_LENGTH - 3] + "..."
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def clock_in_reminder_message(worker_name: str) -> str:
     """Generate clock-in reminder message"""
-    return f"Hi {worker_name}, this is a reminder from {COMPANY_NAME} to clock in for your shift. Please open the RAW Timesheet app to clock in."
+    return single_segment(f"Hi {worker_name}, this is a reminder from {COMPANY_NAME} to clock in for your shift. Please open the RAW Timesheet app to clock in.")
 
 
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def clock_out_reminder_message(worker_name: str) -> str:
     """Generate clock-out reminder message"""
-    return f"Hi {worker_name}, this is a reminder from {COMPANY_NAME} to clock out. Please open the RAW Timesheet app to clock out before leaving site."
+    return single_segment(f"Hi {worker_name}, this is a reminder from {COMPANY_NAME} to clock out. Please open the RAW Timesheet app to clock out before leaving site.")
 
 
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def timesheet_approved_message(worker_name: str, docket_number: str) -> str:
     """Generate timesheet approval notification"""
-    return f"Hi {worker_name}, your timesheet #{docket_number} has been approved by {COMPANY_NAME}."
+    return single_segment(f"Hi {worker_name}, your timesheet #{docket_number} has been approved by {COMPANY_NAME}.")
 
 
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def timesheet_rejected_message(worker_name: str, docket_number: str) -> str:
     """Generate timesheet rejection notification"""
-    return f"Hi {worker_name}, your timesheet #{docket_number} needs attention. Please check the RAW Timesheet app for details."
+    return single_segment(f"Hi {worker_name}, your timesheet #{docket_number} needs attention. Please check the RAW Timesheet app for details.")